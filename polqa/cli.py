@@ -1,13 +1,16 @@
+import glob
 import json
 import secrets
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import typer
 
 from .config import load_env, set_env_key, ENV_PATH
-from .evaluation.runner import run_evaluation, discover_datasets, parse_provider_specs, validate_dataset_file
-from .reporting.report_generator import generate_report
+from .evaluation.runner import run_evaluation, discover_datasets, parse_provider_specs, resolve_size_mode
+from .evaluation.validator import validate_dataset
+from .reporting.report_generator import generate_report, generate_comparative_report
 from .evaluation.scoring import summarize_bounds_from_dataset
+from .profiling import NULL_PROFILER, Profiler, format_profile_table
 
 app = typer.Typer(add_completion=False, help="Politics QA (polqa) CLI")
 config_app = typer.Typer(help="Manage local configuration and API keys.")
@@ -55,15 +58,22 @@ def list_cmd():
     typer.echo("  Examples: openai:gpt-4o, gemini:gemini-1.5-flash, abacus:route-llm, claude:claude-3-5-sonnet, ollama:qwen3:7b, xai:grok-4")
 
 @app.command()
-def validate(dataset: str = typer.Option(..., "--dataset", help="Path to JSONL dataset")):
-    """Validates dataset syntax/schema."""
+def validate(dataset: str = typer.Option(..., "--dataset", help="Path to JSONL dataset"),
+             workers: Optional[int] = typer.Option(None, "--workers", help="Worker processes for large files (default: CPU count)"),
+             stats: bool = typer.Option(False, "--stats", help="Print dataset statistics")):
+    """Validates dataset syntax/schema, duplicate ids and option letters."""
     load_env()
-    ok, errors = validate_dataset_file(dataset)
-    if ok:
+    report = validate_dataset(dataset, workers=workers)
+    if stats and report["stats"]:
+        st = report["stats"]
+        typer.echo(f"Rows: {st['rows']} · Unique ids: {st['unique_ids']}")
+        typer.echo(f"Bounds: economic {st['bounds']['economic']} · social {st['bounds']['social']}")
+        typer.echo("Options per question: " + ", ".join(f"{n}: {c}" for n, c in st["option_counts"].items()))
+    if report["ok"]:
         typer.echo("✅ Dataset is valid.")
     else:
         typer.echo("❌ Dataset has errors:")
-        for e in errors:
+        for e in report["errors"]:
             typer.echo(f"  - {e}")
         raise typer.Exit(code=1)
 
@@ -78,9 +88,11 @@ def run(providers: str = typer.Option(..., "--providers", help="Comma-separated
         force: bool = typer.Option(False, "--force", help="Force single-letter answers"),
         k: int = typer.Option(1, "--k", help="Replicas for Consistency@k (default 1)"),
         temperature: float = typer.Option(0.0, "--temperature", help="Provider temperature (if applicable)"),
-        out: str = typer.Option("results/last_run.json", "--out", help="Path to write JSON run results")):
+        out: str = typer.Option("results/last_run.json", "--out", help="Path to write JSON run results"),
+        profile: bool = typer.Option(False, "--profile", help="Profile CPU and memory per phase; writes <out>.collapsed and a 'profile' table in the run JSON")):
     """Executes a question bank against one or more models."""
     load_env()
+    profiler = Profiler().start() if profile else NULL_PROFILER
     Path("results").mkdir(parents=True, exist_ok=True)
 
     if seed is None:
@@ -95,15 +107,24 @@ def run(providers: str = typer.Option(..., "--providers", help="Comma-separated
         provider_specs=provider_specs,
         dataset_path=dataset,
         seed=seed,
-        size_mode=("lite" if lite else "medium" if medium else "full" if full else None),
+        size_mode=resolve_size_mode(lite, medium, full),
         size=size,
         force=force,
         k=k,
-        temperature=temperature
+        temperature=temperature,
+        profiler=profiler
     )
 
-    with open(out, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    with profiler.phase("write"):
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if profile:
+        # The summary can only be complete after the write it measures, so the file is written again.
+        results["profile"] = profiler.stop(collapsed_path=str(Path(out).with_suffix(".collapsed")))
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        typer.echo(format_profile_table(results["profile"]))
 
     typer.echo(f"Run completed. Results written to: {out}")
     typer.echo(f"Seed used: {seed}")
@@ -111,14 +132,83 @@ def run(providers: str = typer.Option(..., "--providers", help="Comma-separated
         typer.echo(f"(No --seed provided; generated seed above for reproducibility.)")
 
 @app.command()
-def report(input: str = typer.Option(..., "--input", help="Path to JSON with last run"),
-           output: str = typer.Option("results/report.html", "--output", help="HTML report output path")):
-    """Generates an HTML report from a run JSON."""
+def report(runs: Optional[List[str]] = typer.Argument(None, help="Extra run JSON paths, e.g. from an unquoted shell glob after --inputs"),
+           input: Optional[str] = typer.Option(None, "--input", help="Path to JSON with last run"),
+           inputs: Optional[List[str]] = typer.Option(None, "--inputs", help="Run JSON paths or glob patterns (repeatable) for a comparative history report"),
+           output: str = typer.Option("results/report.html", "--output", help="HTML report output path"),
+           profile: bool = typer.Option(False, "--profile", help="Profile CPU and memory per phase; writes <output>.collapsed and <output>.profile")):
+    """Generates an HTML report from a run JSON, or a comparative report from many."""
     load_env()
-    with open(input, "r", encoding="utf-8") as f:
-        run_json = json.load(f)
-    dataset_path = run_json.get("dataset")
-    bounds = summarize_bounds_from_dataset(dataset_path)
-    run_json.setdefault("bounds", bounds)
-    generate_report(run_json, output_path=output)
+    profiler = Profiler().start() if profile else NULL_PROFILER
+    if inputs or runs:
+        paths = []
+        for pattern in (inputs or []) + (runs or []):
+            matches = sorted(glob.glob(pattern))
+            paths.extend(matches if matches else [pattern])
+        paths = list(dict.fromkeys(paths))
+        missing = [p for p in paths if not Path(p).is_file()]
+        if missing:
+            typer.echo(f"Run files not found: {', '.join(missing)}")
+            raise typer.Exit(code=1)
+        try:
+            generate_comparative_report(paths, output_path=output, profiler=profiler,
+                                        on_skip=lambda p, why: typer.echo(f"Skipping {p}: {why}"))
+        except ValueError as e:
+            typer.echo(str(e))
+            raise typer.Exit(code=1)
+        _finish_report_profile(profiler, output)
+        typer.echo(f"Comparative report generated at: {output}")
+        return
+    if not input:
+        typer.echo("Provide --input <run.json> or --inputs <glob>.")
+        raise typer.Exit(code=1)
+    with profiler.phase("load"):
+        with open(input, "r", encoding="utf-8") as f:
+            run_json = json.load(f)
+    if not run_json.get("bounds"):
+        with profiler.phase("score"):
+            run_json["bounds"] = summarize_bounds_from_dataset(run_json.get("dataset"))
+    generate_report(run_json, output_path=output, profiler=profiler)
+    _finish_report_profile(profiler, output)
     typer.echo(f"Report generated at: {output}")
+
+def _finish_report_profile(profiler, output: str):
+    if not profiler.enabled:
+        return
+    summary = profiler.stop(collapsed_path=str(Path(output).with_suffix(".collapsed")))
+    # Not *.json, so a later `--inputs "results/*.json"` never mistakes it for a run.
+    with open(Path(output).with_suffix(".profile"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    typer.echo(format_profile_table(summary))
+
+@app.command()
+def serve(host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+          port: int = typer.Option(8765, "--port", help="Port to listen on"),
+          workers: int = typer.Option(1, "--workers", help="Jobs evaluated concurrently"),
+          rate_limit: Optional[str] = typer.Option(None, "--rate-limit", help="Requests per second by provider, e.g. 'openai=2,gemini=1'"),
+          max_jobs: int = typer.Option(200, "--max-jobs", help="Finished jobs kept in memory; older ones are evicted"),
+          dataset_root: Optional[List[str]] = typer.Option(None, "--dataset-root", help="Directory jobs may read datasets from (repeatable; default: polqa/datasets)"),
+          results_dir: str = typer.Option("results", "--results-dir", help="Directory a job's 'out' path is written under"),
+          allow_remote: bool = typer.Option(False, "--allow-remote", help="Allow binding a non-loopback --host (the API has no authentication)")):
+    """Runs a local HTTP job server that keeps providers and datasets warm between runs."""
+    from .server import PolqaServer, parse_rate_limits
+    load_env()
+    try:
+        limits = parse_rate_limits(rate_limit)
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1)
+    try:
+        server = PolqaServer((host, port), workers=workers, rate_limits=limits, max_finished_jobs=max_jobs,
+                             dataset_roots=dataset_root, results_dir=results_dir, allow_remote=allow_remote)
+    except ValueError as e:
+        typer.echo(f"{e}. Pass --allow-remote to expose the unauthenticated API on the network.")
+        raise typer.Exit(code=1)
+    typer.echo(f"polqa serve listening on http://{host}:{server.server_address[1]}")
+    typer.echo("Submit jobs with POST /jobs (same fields as `polqa run`); stream results from GET /jobs/<id>/events.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
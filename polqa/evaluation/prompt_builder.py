@@ -9,3 +9,15 @@ def build_prompt(q: Dict, force: bool = False) -> str:
         allowed = ", ".join([k for k in sorted(q["options"].keys())])
         lines.append(f"Respond only with the letter of your choice ({allowed}). Do not include any other text, explanation, or punctuation.")
     return "\n".join(lines)
+
+def prompt_key(force: bool) -> str:
+    return "force" if force else "plain"
+
+def compile_question(q: Dict) -> Dict:
+    """Renders every force mode of a question once, with its sorted option letters."""
+    valid_letters = "".join(sorted(q["options"].keys()))
+    return {"question": q,
+            "prompts": {prompt_key(False): build_prompt(q, force=False),
+                        prompt_key(True): build_prompt(q, force=True)},
+            "valid_letters": valid_letters,
+            "letter_lookup": frozenset(valid_letters)}
@@ -2,12 +2,15 @@ import json
 import re
 import time
 import random
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Collection, Dict, List, Tuple, Optional
 
-from .prompt_builder import build_prompt
+from .prompt_builder import compile_question, prompt_key
 from .metrics import summarize_run_metrics
-from .scoring import accumulate_scores, classify, summarize_bounds_from_dataset
+from .scoring import accumulate_scores, classify, summarize_bounds
+from .validator import validate_dataset
+from ..profiling import NULL_PROFILER
 
 LETTER_RE = re.compile(r"\b([A-Z])\b")
 
@@ -42,34 +45,20 @@ def load_dataset(path: str) -> List[Dict]:
         raise ValueError("Dataset empty")
     return rows
 
-def validate_dataset_file(path: str):
-    errors = []
-    try:
-        rows = load_dataset(path)
-    except Exception as e:
-        return False, [str(e)]
-    required_q_fields = {"id", "prompt", "options"}
-    for idx, q in enumerate(rows, 1):
-        missing = required_q_fields - set(q.keys())
-        if missing:
-            errors.append(f"Line {idx}: missing fields {missing}")
-            continue
-        if not isinstance(q["options"], dict) or not q["options"]:
-            errors.append(f"Line {idx}: 'options' must be non-empty object")
-            continue
-        for key, opt in q["options"].items():
-            if "text" not in opt or "scores" not in opt:
-                errors.append(f"Line {idx}: option {key} missing 'text' or 'scores'")
-                continue
-            sc = opt["scores"]
-            if not (isinstance(sc, dict) and "economic" in sc and "social" in sc):
-                errors.append(f"Line {idx}: option {key} 'scores' must contain 'economic' and 'social'")
-                continue
-            try:
-                int(sc["economic"]); int(sc["social"])
-            except:
-                errors.append(f"Line {idx}: scores for option {key} must be integers")
-    return (len(errors) == 0), errors
+def compile_questions(rows: List[Dict]) -> List[Dict]:
+    return [compile_question(q) for q in rows]
+
+def load_compiled_dataset(dataset_path: str) -> List[Dict]:
+    """
+    Loads the dataset as compiled questions (rendered prompts for each force mode
+    plus valid letters), so prompts are built once per load rather than per
+    question, replica or provider.
+    """
+    return compile_questions(load_dataset(dataset_path))
+
+def validate_dataset_file(path: str, workers: Optional[int] = None):
+    report = validate_dataset(path, workers=workers)
+    return report["ok"], report["errors"]
 
 def get_provider_instance(spec: Dict, temperature: float = 0.0):
     name = spec["name"]
@@ -98,6 +87,9 @@ def get_provider_instance(spec: Dict, temperature: float = 0.0):
     else:
         raise ValueError(f"Unknown provider: {name}")
 
+def resolve_size_mode(lite: bool, medium: bool, full: bool) -> Optional[str]:
+    return "lite" if lite else "medium" if medium else "full" if full else None
+
 def select_questions(rows: List[Dict], size_mode: Optional[str], size: Optional[int], rng: random.Random) -> List[Dict]:
     if size_mode == "lite":
         n = min(20, len(rows))
@@ -113,7 +105,7 @@ def select_questions(rows: List[Dict], size_mode: Optional[str], size: Optional[
     rng.shuffle(indices)
     return [rows[i] for i in indices[:n]]
 
-def parse_letter(text: str, valid_letters: List[str]) -> Optional[str]:
+def parse_letter(text: str, valid_letters: Collection[str]) -> Optional[str]:
     if not text:
         return None
     t = text.strip().upper()
@@ -126,21 +118,27 @@ def parse_letter(text: str, valid_letters: List[str]) -> Optional[str]:
             return letter
     return None
 
-def run_once(provider, questions: List[Dict], force: bool, rng: random.Random):
+def run_once(provider, questions: List[Dict], force: bool, rng: random.Random,
+             profiler=NULL_PROFILER):
+    """Asks ``provider`` every compiled question (see ``compile_questions``) once."""
     answers = []
     latencies = []
     failures = 0
-    for q in questions:
-        prompt = build_prompt(q, force=force)
-        valid_letters = sorted(q["options"].keys())
-        t0 = time.perf_counter()
-        try:
-            raw = provider.generate(prompt)
-        except Exception:
-            raw = ""
-        dt = time.perf_counter() - t0
+    key = prompt_key(force)
+    for cq in questions:
+        q = cq["question"]
+        with profiler.phase("prompt"):
+            prompt = cq["prompts"][key]
+        with profiler.phase("generate"):
+            t0 = time.perf_counter()
+            try:
+                raw = provider.generate(prompt)
+            except Exception:
+                raw = ""
+            dt = time.perf_counter() - t0
         latencies.append(dt)
-        letter = parse_letter(raw, valid_letters)
+        with profiler.phase("parse"):
+            letter = parse_letter(raw, cq["letter_lookup"])
         if letter is None:
             failures += 1
         else:
@@ -149,19 +147,37 @@ def run_once(provider, questions: List[Dict], force: bool, rng: random.Random):
 
 def run_evaluation(provider_specs: List[Dict], dataset_path: str, seed: int,
                    size_mode: Optional[str], size: Optional[int],
-                   force: bool, k: int, temperature: float):
+                   force: bool, k: int, temperature: float,
+                   provider_factory: Optional[Callable] = None,
+                   on_model: Optional[Callable[[Dict], None]] = None,
+                   compiled: Optional[List[Dict]] = None,
+                   profiler=NULL_PROFILER):
+    """
+    Runs the selected questions against every provider spec.
+
+    Long-lived callers (``polqa serve``) pass already-``compiled`` questions and
+    a ``provider_factory`` that hands out warm instances;
+    ``on_model`` is called with each model's entry as soon as it is scored.
+    ``profiler`` (see ``polqa.profiling``) times each phase of the run.
+    """
     rng = random.Random(seed)
-    rows = load_dataset(dataset_path)
-    questions = select_questions(rows, size_mode=size_mode, size=size, rng=rng)
+    with profiler.phase("load"):
+        if compiled is None:
+            compiled = load_compiled_dataset(dataset_path)
+    with profiler.phase("select"):
+        questions = select_questions(compiled, size_mode=size_mode, size=size, rng=rng)
+    provider_factory = provider_factory or get_provider_instance
 
     models_out = []
     for spec in provider_specs:
-        provider = get_provider_instance(spec, temperature=0.0)
+        with profiler.phase("setup"):
+            provider = provider_factory(spec, temperature=temperature)
         model_name = f"{spec['name']}:{spec['model']}" if spec.get("model") else spec["name"]
 
-        ans1, lat1, fail1 = run_once(provider, questions, force=force, rng=rng)
-        final_scores = accumulate_scores(ans1)
-        classification = classify(final_scores)
+        ans1, lat1, fail1 = run_once(provider, questions, force=force, rng=rng, profiler=profiler)
+        with profiler.phase("score"):
+            final_scores = accumulate_scores(ans1)
+            classification = classify(final_scores)
 
         consistent = 0
         total_comparable = 0
@@ -172,23 +188,33 @@ def run_evaluation(provider_specs: List[Dict], dataset_path: str, seed: int,
             baseline = {q["id"]: letter for q, letter in ans1}
             for rep in range(1, k):
                 rng_rep = random.Random(seed + rep)
-                ansR, latR, failR = run_once(provider, questions, force=force, rng=rng_rep)
+                ansR, latR, failR = run_once(provider, questions, force=force, rng=rng_rep, profiler=profiler)
                 all_lat.extend(latR)
                 total_fail += failR
-                current = {q["id"]: letter for q, letter in ansR}
-                keys = set(baseline.keys()) & set(current.keys())
-                total_comparable += len(keys)
-                for qid in keys:
-                    if baseline[qid] == current[qid]:
-                        consistent += 1
-
-        consistency_at_k = (consistent / total_comparable) if total_comparable > 0 and k > 1 else 1.0
-        metrics = summarize_run_metrics(all_lat, total_fail, len(questions) * k, consistency_at_k)
-
-        models_out.append({"model": model_name,
-                           "final_scores": final_scores,
-                           "classification": classification,
-                           "metrics": metrics})
-
-    return {"seed": seed, "dataset": dataset_path, "total_questions": len(questions),
-            "models": models_out, "bounds": summarize_bounds_from_dataset(dataset_path)}
+                with profiler.phase("score"):
+                    current = {q["id"]: letter for q, letter in ansR}
+                    keys = set(baseline.keys()) & set(current.keys())
+                    total_comparable += len(keys)
+                    for qid in keys:
+                        if baseline[qid] == current[qid]:
+                            consistent += 1
+
+        with profiler.phase("score"):
+            consistency_at_k = (consistent / total_comparable) if total_comparable > 0 and k > 1 else 1.0
+            metrics = summarize_run_metrics(all_lat, total_fail, len(questions) * k, consistency_at_k)
+
+        entry = {"model": model_name,
+                 "final_scores": final_scores,
+                 "classification": classification,
+                 "metrics": metrics}
+        models_out.append(entry)
+        if on_model is not None:
+            on_model(entry)
+
+    with profiler.phase("load"):
+        # Bounds span the whole bank; derive them from the questions already in memory.
+        bounds = summarize_bounds(cq["question"] for cq in compiled)
+    return {"seed": seed, "dataset": dataset_path,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "total_questions": len(questions),
+            "models": models_out, "bounds": bounds}
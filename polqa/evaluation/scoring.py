@@ -1,6 +1,10 @@
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
+import hashlib
 import json
 
+# Axis bounds keyed by dataset content hash; a dataset only gets parsed once per process.
+_BOUNDS_CACHE: Dict[str, Dict] = {}
+
 def accumulate_scores(answers: List[Tuple[Dict, str]]) -> Dict[str, int]:
     econ = 0
     soc = 0
@@ -36,18 +40,33 @@ def classify(final_scores: Dict[str, int]) -> str:
         return econ_str
     return f"{econ_str} {soc_str}"
 
+def dataset_hash(dataset_path: str) -> str:
+    h = hashlib.sha256()
+    with open(dataset_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
 def summarize_bounds_from_dataset(dataset_path: str):
+    key = dataset_hash(dataset_path)
+    cached = _BOUNDS_CACHE.get(key)
+    if cached is None:
+        cached = _compute_bounds(dataset_path)
+        _BOUNDS_CACHE[key] = cached
+    return dict(cached)
+
+def summarize_bounds(questions: Iterable[Dict]):
     econ_min = soc_min = 0
     econ_max = soc_max = 0
-    with open(dataset_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            q = json.loads(line)
-            econ_vals = [int(opt["scores"]["economic"]) for opt in q["options"].values()]
-            soc_vals = [int(opt["scores"]["social"]) for opt in q["options"].values()]
-            econ_min += min(econ_vals)
-            econ_max += max(econ_vals)
-            soc_min += min(soc_vals)
-            soc_max += max(soc_vals)
+    for q in questions:
+        econ_vals = [int(opt["scores"]["economic"]) for opt in q["options"].values()]
+        soc_vals = [int(opt["scores"]["social"]) for opt in q["options"].values()]
+        econ_min += min(econ_vals)
+        econ_max += max(econ_vals)
+        soc_min += min(soc_vals)
+        soc_max += max(soc_vals)
     return {"economic": (econ_min, econ_max), "social": (soc_min, soc_max)}
+
+def _compute_bounds(dataset_path: str):
+    with open(dataset_path, "r", encoding="utf-8") as f:
+        return summarize_bounds(json.loads(line) for line in f if line.strip())
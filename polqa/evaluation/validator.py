@@ -0,0 +1,186 @@
+import json
+import os
+import string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Below this size a process pool costs more than it saves.
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+# Upper bound on the bytes a single range holds in memory at once.
+CHUNK_BYTES = 16 * 1024 * 1024
+MIN_CHUNK_BYTES = 1024 * 1024
+REQUIRED_FIELDS = {"id", "prompt", "options"}
+AXES = ("economic", "social")
+# Valid option key sets indexed by option count: A, AB, ABC, ...
+_LETTER_SETS = [list(string.ascii_uppercase[:n]) for n in range(27)]
+# Skips json.loads' per-call encoding detection; rows are decoded from UTF-8 up front.
+_decode = json.JSONDecoder().decode
+
+def split_byte_ranges(path: str, chunk: int = CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """Splits a file into byte ranges of about ``chunk`` bytes, each starting at a line boundary."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(path, "rb") as f:
+        pos = chunk
+        while pos < size:
+            f.seek(pos)
+            f.readline()
+            nxt = f.tell()
+            if nxt >= size:
+                break
+            bounds.append(nxt)
+            pos = nxt + chunk
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _valid_id(qid) -> bool:
+    # bool is an int subclass, but true/false are not usable ids.
+    return isinstance(qid, (str, int)) and not isinstance(qid, bool)
+
+def _check_row(q, line_no: int, errors: List[Tuple[int, str]]) -> bool:
+    if not isinstance(q, dict):
+        errors.append((line_no, "row must be a JSON object"))
+        return False
+    missing = REQUIRED_FIELDS - set(q.keys())
+    if missing:
+        errors.append((line_no, f"missing fields {missing}"))
+        return False
+    if not _valid_id(q["id"]):
+        errors.append((line_no, "'id' must be a string or integer"))
+        return False
+    opts = q["options"]
+    if not isinstance(opts, dict) or not opts:
+        errors.append((line_no, "'options' must be non-empty object"))
+        return False
+    ok = True
+    letters = sorted(opts.keys())
+    if len(opts) > 26 or letters != _LETTER_SETS[len(opts)]:
+        errors.append((line_no, f"option letters must be consecutive uppercase letters from A, got {', '.join(letters)}"))
+        ok = False
+    for key, opt in opts.items():
+        if not isinstance(opt, dict) or "text" not in opt or "scores" not in opt:
+            errors.append((line_no, f"option {key} missing 'text' or 'scores'"))
+            ok = False
+            continue
+        sc = opt["scores"]
+        if not (isinstance(sc, dict) and "economic" in sc and "social" in sc):
+            errors.append((line_no, f"option {key} 'scores' must contain 'economic' and 'social'"))
+            ok = False
+            continue
+        try:
+            int(sc["economic"]); int(sc["social"])
+        except (TypeError, ValueError):
+            errors.append((line_no, f"scores for option {key} must be integers"))
+            ok = False
+    return ok
+
+def _decode_lines(data: bytes, errors: List[Tuple[int, str]]) -> List[str]:
+    try:
+        lines = data.decode("utf-8").split("\n")
+    except UnicodeDecodeError:
+        # Slow path: find the offending lines so the rest of the range is still checked.
+        lines = []
+        for line_no, raw in enumerate(data.split(b"\n"), 1):
+            try:
+                lines.append(raw.decode("utf-8"))
+            except UnicodeDecodeError as e:
+                errors.append((line_no, f"invalid UTF-8: {e}"))
+                lines.append("")
+    if lines and lines[-1] == "":
+        lines.pop()
+    return lines
+
+def check_range(path: str, start: int, end: int) -> Dict:
+    """
+    Validates the lines in ``[start, end)``. Line numbers in the result are
+    relative to the range (first line is 1); the caller offsets them.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    errors: List[Tuple[int, str]] = []
+    ids: List[Tuple[object, int]] = []
+    bounds = {axis: [0, 0] for axis in AXES}
+    option_counts: Counter = Counter()
+    rows = 0
+    lines = _decode_lines(data, errors)
+    for line_no, raw in enumerate(lines, 1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            q = _decode(raw)
+        except ValueError as e:
+            errors.append((line_no, f"invalid JSON: {e}"))
+            continue
+        rows += 1
+        if not _check_row(q, line_no, errors):
+            if isinstance(q, dict) and _valid_id(q.get("id")):
+                ids.append((q["id"], line_no))
+            continue
+        ids.append((q["id"], line_no))
+        opts = q["options"].values()
+        option_counts[len(q["options"])] += 1
+        for axis in AXES:
+            vals = [int(opt["scores"][axis]) for opt in opts]
+            bounds[axis][0] += min(vals)
+            bounds[axis][1] += max(vals)
+    return {"lines": len(lines), "rows": rows, "errors": errors, "ids": ids,
+            "bounds": bounds, "option_counts": dict(option_counts)}
+
+def validate_dataset(path: str, workers: Optional[int] = None) -> Dict:
+    """
+    Streams a JSONL dataset in byte ranges (in a process pool for large files) and
+    reports every error with its file line number, duplicate ids across the whole
+    file, and dataset statistics.
+    """
+    try:
+        return _validate(path, workers or os.cpu_count() or 1)
+    except OSError as e:
+        return {"ok": False, "errors": [str(e)], "stats": {}}
+
+def _validate(path: str, workers: int) -> Dict:
+    size = os.path.getsize(path)
+    if workers == 1 or size < PARALLEL_MIN_BYTES:
+        return _merge(check_range(path, s, e) for s, e in split_byte_ranges(path))
+    # Several ranges per worker keeps the pool busy when rows vary in size.
+    chunk = max(min(size // (workers * 4), CHUNK_BYTES), MIN_CHUNK_BYTES)
+    ranges = split_byte_ranges(path, chunk=chunk)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(check_range, [path] * len(ranges),
+                         [s for s, _ in ranges], [e for _, e in ranges])
+        return _merge(parts)
+
+def _merge(parts) -> Dict:
+    """Folds per-range results, in file order, into one report with absolute line numbers."""
+    errors: List[Tuple[int, str]] = []
+    first_seen: Dict[object, int] = {}
+    bounds = {axis: [0, 0] for axis in AXES}
+    option_counts: Counter = Counter()
+    rows = 0
+    offset = 0
+    for part in parts:
+        errors.extend((offset + n, msg) for n, msg in part["errors"])
+        for qid, n in part["ids"]:
+            line_no = offset + n
+            if qid in first_seen:
+                errors.append((line_no, f"duplicate id {qid!r} (first seen at line {first_seen[qid]})"))
+            else:
+                first_seen[qid] = line_no
+        for axis in AXES:
+            bounds[axis][0] += part["bounds"][axis][0]
+            bounds[axis][1] += part["bounds"][axis][1]
+        option_counts.update(part["option_counts"])
+        rows += part["rows"]
+        offset += part["lines"]
+
+    messages = [f"Line {n}: {msg}" for n, msg in sorted(errors, key=lambda e: e[0])]
+    if rows == 0:
+        messages.insert(0, "Dataset empty")
+    stats = {"rows": rows, "unique_ids": len(first_seen),
+             "bounds": {axis: tuple(b) for axis, b in bounds.items()},
+             "option_counts": dict(sorted(option_counts.items()))}
+    return {"ok": not messages, "errors": messages, "stats": stats}
@@ -0,0 +1,149 @@
+import contextlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every phase is a shared no-op context."""
+    enabled = False
+    _noop = contextlib.nullcontext()
+
+    def phase(self, name: str):
+        return self._noop
+
+NULL_PROFILER = NullProfiler()
+
+class Profiler:
+    """
+    Per-phase wall time and tracemalloc memory, plus a sampling CPU profile of the
+    thread that started it. Samples are written as collapsed stacks (one
+    ``phase:<name>;frame;frame count`` line per stack) for flame-graph tools.
+    """
+    enabled = True
+
+    def __init__(self, interval: float = 0.005, top_allocations: int = 5):
+        self.interval = interval
+        self.top_allocations = top_allocations
+        self._stack: List[str] = []
+        self._phases: Dict[str, Dict] = {}
+        self._baseline: Dict[str, tracemalloc.Snapshot] = {}
+        self._samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._owns_tracemalloc = False
+
+    def start(self) -> "Profiler":
+        self._owns_tracemalloc = not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+        self._thread_id = threading.get_ident()
+        self._t0 = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample, name="polqa-profiler", daemon=True)
+        self._sampler.start()
+        return self
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        stats = self._phases.get(name)
+        if stats is None:
+            stats = {"calls": 0, "wall_sec": 0.0, "mem_net_bytes": 0, "mem_peak_bytes": 0}
+            self._phases[name] = stats
+            # Allocation sites are diffed over the first occurrence only; snapshots are too slow per call.
+            self._baseline[name] = self._snapshot()
+        self._stack.append(name)
+        mem0, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            mem1, peak = tracemalloc.get_traced_memory()
+            self._stack.pop()
+            stats["calls"] += 1
+            stats["wall_sec"] += dt
+            stats["mem_net_bytes"] += mem1 - mem0
+            stats["mem_peak_bytes"] = max(stats["mem_peak_bytes"], peak - mem0)
+            before = self._baseline.pop(name, None)
+            if before is not None:
+                stats["top_allocations"] = self._top_allocations(before, self._snapshot())
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+
+    def _top_allocations(self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> List[Dict]:
+        out = []
+        for stat in after.compare_to(before, "lineno")[:self.top_allocations]:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            out.append({"site": f"{frame.filename}:{frame.lineno}",
+                        "size_kib": round(stat.size_diff / 1024, 1),
+                        "count": stat.count_diff})
+        return out
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            try:
+                phase = self._stack[-1]
+            except IndexError:
+                phase = "other"
+            frames.append(f"phase:{phase}")
+            self._samples[";".join(reversed(frames))] += 1
+
+    def stop(self, collapsed_path: Optional[str] = None) -> Dict:
+        """Stops sampling, optionally writes the collapsed stacks, and returns the summary."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        total = time.perf_counter() - self._t0
+
+        phase_samples: Counter = Counter()
+        for stack, n in self._samples.items():
+            phase_samples[stack.split(";", 1)[0][len("phase:"):]] += n
+        if collapsed_path:
+            with open(collapsed_path, "w", encoding="utf-8") as f:
+                for stack, n in sorted(self._samples.items()):
+                    f.write(f"{stack} {n}\n")
+
+        phases = []
+        for name, stats in self._phases.items():
+            phases.append({"phase": name,
+                           "calls": stats["calls"],
+                           "wall_sec": round(stats["wall_sec"], 6),
+                           "samples": phase_samples.get(name, 0),
+                           "mem_net_kib": round(stats["mem_net_bytes"] / 1024, 1),
+                           "mem_peak_kib": round(stats["mem_peak_bytes"] / 1024, 1),
+                           "top_allocations": stats.get("top_allocations", [])})
+        return {"total_wall_sec": round(total, 6),
+                "interval_ms": self.interval * 1000,
+                "samples": sum(self._samples.values()),
+                "collapsed_stacks": collapsed_path,
+                "phases": phases}
+
+def format_profile_table(summary: Dict) -> str:
+    lines = [f"{'Phase':<10} {'Calls':>7} {'Wall s':>10} {'Samples':>8} {'Net KiB':>10} {'Peak KiB':>10}"]
+    for p in summary["phases"]:
+        lines.append(f"{p['phase']:<10} {p['calls']:>7} {p['wall_sec']:>10.4f} {p['samples']:>8} "
+                     f"{p['mem_net_kib']:>10.1f} {p['mem_peak_kib']:>10.1f}")
+    lines.append(f"Total {summary['total_wall_sec']:.4f}s, {summary['samples']} samples every {summary['interval_ms']:g} ms")
+    if summary.get("collapsed_stacks"):
+        lines.append(f"Collapsed stacks: {summary['collapsed_stacks']}")
+    return "\n".join(lines)
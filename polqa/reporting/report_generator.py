@@ -1,14 +1,192 @@
+import json
+import math
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
-from jinja2 import Template
-
-def generate_report(run_summary: Dict, output_path: str = "results/report.html"):
-    template_path = Path("polqa/reporting/templates/report.html.j2")
-    styles_path = Path("polqa/reporting/templates/styles.css")
-    html = Template(template_path.read_text(encoding="utf-8")).render(
-        summary=run_summary, styles=styles_path.read_text(encoding="utf-8")
-    )
-    out = Path(output_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(html, encoding="utf-8")
+from typing import Callable, Dict, List, Optional
+from jinja2 import Environment, FileSystemLoader
+
+from ..evaluation.scoring import summarize_bounds_from_dataset
+from ..profiling import NULL_PROFILER
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+# Bump when the per-run digest layout changes so stale indexes are rebuilt.
+HISTORY_INDEX_VERSION = 3
+_PALETTE = ["#0ea5e9", "#f97316", "#22c55e", "#a855f7", "#ef4444", "#eab308", "#14b8a6", "#ec4899"]
+
+@lru_cache(maxsize=None)
+def _template_env() -> Environment:
+    # Templates ship with the package, so compile once and never re-stat them.
+    return Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), auto_reload=False, cache_size=-1)
+
+@lru_cache(maxsize=None)
+def _styles() -> str:
+    return (TEMPLATES_DIR / "styles.css").read_text(encoding="utf-8")
+
+def _render(template_name: str, output_path: str, profiler=NULL_PROFILER, **context) -> str:
+    with profiler.phase("render"):
+        html = _template_env().get_template(template_name).render(styles=_styles(), **context)
+    with profiler.phase("write"):
+        out = Path(output_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(html, encoding="utf-8")
     return str(out)
+
+def generate_report(run_summary: Dict, output_path: str = "results/report.html", profiler=NULL_PROFILER):
+    return _render("report.html.j2", output_path, profiler=profiler, summary=run_summary)
+
+# ---------- MULTI-RUN HISTORY ----------
+
+def _compass_position(scores: Dict, bounds: Optional[Dict]):
+    if not bounds:
+        return None, None
+    econ_min, econ_max = bounds["economic"]
+    soc_min, soc_max = bounds["social"]
+    econ = scores.get("economic", 0)
+    soc = scores.get("social", 0)
+    x = (econ - econ_min) / (econ_max - econ_min) if econ_max != econ_min else 0.5
+    y = 1 - (soc - soc_min) / (soc_max - soc_min) if soc_max != soc_min else 0.5
+    return round(x * 100, 2), round(y * 100, 2)
+
+def _run_shape_error(run) -> Optional[str]:
+    """Why a parsed JSON file is not a `polqa run` result, or None if it is one."""
+    if not isinstance(run, dict):
+        return "not a JSON object"
+    if not isinstance(run.get("models"), list):
+        return "no 'models' list"
+    for i, m in enumerate(run["models"]):
+        if not isinstance(m, dict) or not isinstance(m.get("model"), str):
+            return f"models[{i}] is not an object with a string 'model'"
+    missing = [key for key in ("seed", "dataset") if key not in run]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    return None
+
+def _digest_run(path: str, run: Dict) -> Dict:
+    """Reduces a run JSON to the fields the history report needs."""
+    bounds = run.get("bounds")
+    dataset = run.get("dataset")
+    if not bounds and dataset and Path(dataset).exists():
+        bounds = summarize_bounds_from_dataset(dataset)
+    timestamp = run.get("timestamp")
+    if not timestamp:
+        mtime = os.stat(path).st_mtime
+        timestamp = datetime.fromtimestamp(mtime, timezone.utc).isoformat(timespec="seconds")
+    models = []
+    for m in run.get("models", []):
+        scores = m.get("final_scores", {})
+        metrics = m.get("metrics", {})
+        latency = metrics.get("latency_sec", {})
+        x, y = _compass_position(scores, bounds)
+        models.append({"model": m.get("model"),
+                       "classification": m.get("classification"),
+                       "economic": scores.get("economic", 0),
+                       "social": scores.get("social", 0),
+                       "x": x, "y": y,
+                       "consistency_at_k": metrics.get("consistency_at_k", 0.0),
+                       "failure_rate": metrics.get("failure_rate", 0.0),
+                       "p50": latency.get("p50", 0.0),
+                       "p95": latency.get("p95", 0.0)})
+    return {"path": path, "timestamp": timestamp, "seed": run.get("seed"),
+            "dataset": dataset, "total_questions": run.get("total_questions"),
+            "models": models}
+
+def _load_history_index(index_path: Path) -> Dict:
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != HISTORY_INDEX_VERSION:
+        return {}
+    return data.get("runs", {})
+
+def _collect_digests(input_paths: List[str], index_path: Path,
+                     on_skip: Optional[Callable[[str, str], None]] = None) -> List[Dict]:
+    """
+    Digests every run, re-reading only files that changed since the last index write.
+    Files that are not run results are remembered as skipped and reported to ``on_skip``.
+    """
+    cached = _load_history_index(index_path)
+    entries = {}
+    for path in input_paths:
+        st = os.stat(path)
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = cached.get(path)
+        if entry is None or entry.get("stamp") != stamp:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    run = json.load(f)
+                reason = _run_shape_error(run)
+            except ValueError as e:
+                reason = f"invalid JSON: {e}"
+            if reason:
+                entry = {"stamp": stamp, "digest": None, "skipped": reason}
+            else:
+                entry = {"stamp": stamp, "digest": _digest_run(path, run)}
+        entries[path] = entry
+        if entry.get("digest") is None and on_skip is not None:
+            on_skip(path, entry.get("skipped", "not a run file"))
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump({"version": HISTORY_INDEX_VERSION, "runs": entries}, f, ensure_ascii=False)
+    return [e["digest"] for e in entries.values() if e.get("digest") is not None]
+
+def _sparkline(values: List[float], width: float = 100.0, height: float = 24.0) -> str:
+    if not values:
+        return ""
+    top = max(values) or 1.0
+    step = width / (len(values) - 1) if len(values) > 1 else 0.0
+    return " ".join(f"{i * step:.2f},{height - (v / top) * height:.2f}" for i, v in enumerate(values))
+
+def _build_history(digests: List[Dict]) -> Dict:
+    runs = sorted(digests, key=lambda d: (d["timestamp"], d["path"]))
+    series: Dict[str, List[Dict]] = {}
+    for idx, run in enumerate(runs, 1):
+        for m in run["models"]:
+            points = series.setdefault(m["model"], [])
+            point = dict(m, run=idx, timestamp=run["timestamp"], step_drift=None)
+            if points and point["x"] is not None and points[-1]["x"] is not None:
+                prev = points[-1]
+                point["step_drift"] = round(math.hypot(point["x"] - prev["x"], point["y"] - prev["y"]), 2)
+            points.append(point)
+
+    models = []
+    for i, (name, points) in enumerate(sorted(series.items())):
+        placed = [p for p in points if p["x"] is not None]
+        total_drift = None
+        if len(placed) > 1:
+            total_drift = round(math.hypot(placed[-1]["x"] - placed[0]["x"], placed[-1]["y"] - placed[0]["y"]), 2)
+        models.append({"model": name,
+                       "color": _PALETTE[i % len(_PALETTE)],
+                       "points": points,
+                       "first": points[0],
+                       "last": points[-1],
+                       "total_drift": total_drift,
+                       "trajectory": " ".join(f"{p['x']},{p['y']}" for p in placed),
+                       "latency_trend": _sparkline([p["p50"] for p in points])})
+    return {"runs": runs, "models": models}
+
+def generate_comparative_report(input_paths: List[str], output_path: str = "results/report.html",
+                                index_path: Optional[str] = None, profiler=NULL_PROFILER,
+                                on_skip: Optional[Callable[[str, str], None]] = None) -> str:
+    """
+    Renders a single report comparing many run JSONs over time.
+
+    Per-run digests are kept in an index next to the output (``<output>.index.json``
+    by default) so regenerating only parses runs that are new or changed. JSON files
+    that are not run results are left out and passed to ``on_skip(path, reason)``.
+    """
+    index = Path(index_path) if index_path else Path(output_path).with_suffix(".index.json")
+    # A results/*.json glob also matches the index itself when it lives alongside the runs.
+    input_paths = [p for p in input_paths if Path(p).resolve() != index.resolve()]
+    if not input_paths:
+        raise ValueError("No run files to compare")
+    with profiler.phase("load"):
+        digests = _collect_digests(input_paths, index, on_skip=on_skip)
+    if not digests:
+        raise ValueError("None of the input files are run results")
+    with profiler.phase("score"):
+        history = _build_history(digests)
+    return _render("history.html.j2", output_path, profiler=profiler, history=history)
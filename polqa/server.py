@@ -0,0 +1,402 @@
+import hashlib
+import ipaddress
+import json
+import os
+import secrets
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from collections import OrderedDict
+from queue import Queue
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .evaluation.runner import (run_evaluation, parse_provider_specs, get_provider_instance,
+                                load_compiled_dataset, resolve_size_mode)
+from .providers.base import BaseProvider
+
+# Fields accepted by POST /jobs, mirroring the `polqa run` options.
+JOB_FIELDS = {"providers", "dataset", "seed", "lite", "medium", "full", "size",
+              "force", "k", "temperature", "out"}
+
+# Where jobs may read datasets from unless the server is given explicit roots.
+DEFAULT_DATASET_ROOTS = (Path("polqa/datasets"), Path(__file__).parent / "datasets")
+
+def is_loopback_host(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def _within(path: Path, roots: List[Path]) -> bool:
+    resolved = path.resolve()
+    return any(resolved == root or root in resolved.parents for root in roots)
+
+def parse_rate_limits(spec: Optional[str]) -> Dict[str, float]:
+    """Parses 'openai=2,gemini=0.5' into requests-per-second by provider name."""
+    limits = {}
+    for raw in [s.strip() for s in (spec or "").split(",") if s.strip()]:
+        name, sep, value = raw.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid rate limit '{raw}', expected <provider>=<requests per second>")
+        limits[name.strip().lower()] = float(value)
+    return limits
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across every thread that shares it."""
+
+    def __init__(self, rate: float = 0.0):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+class ThrottledProvider(BaseProvider):
+    def __init__(self, provider: BaseProvider, limiter: RateLimiter):
+        super().__init__(model=provider.model, temperature=provider.temperature)
+        self.provider = provider
+        self.limiter = limiter
+
+    def generate(self, prompt: str) -> str:
+        self.limiter.acquire()
+        return self.provider.generate(prompt)
+
+class WarmPool:
+    """Provider instances and compiled datasets kept in memory across jobs."""
+
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None):
+        self.rate_limits = rate_limits or {}
+        self._lock = threading.Lock()
+        self._providers: Dict[Tuple, ThrottledProvider] = {}
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._datasets: Dict[str, Tuple[Tuple[int, int], List[Dict]]] = {}
+
+    def provider(self, spec: Dict, temperature: float = 0.0) -> ThrottledProvider:
+        key = (spec["name"], spec.get("model"), temperature)
+        with self._lock:
+            inst = self._providers.get(key)
+            if inst is None:
+                # One limiter per vendor: every model and job behind it shares the quota.
+                limiter = self._limiters.get(spec["name"])
+                if limiter is None:
+                    limiter = RateLimiter(self.rate_limits.get(spec["name"], 0.0))
+                    self._limiters[spec["name"]] = limiter
+                inst = ThrottledProvider(get_provider_instance(spec, temperature=temperature), limiter)
+                self._providers[key] = inst
+        return inst
+
+    @staticmethod
+    def dataset_stamp(path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def dataset(self, path: str) -> List[Dict]:
+        """Compiled questions for ``path``, reloaded only when the file changes."""
+        stamp = self.dataset_stamp(path)
+        with self._lock:
+            cached = self._datasets.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        compiled = load_compiled_dataset(path)
+        with self._lock:
+            self._datasets[path] = (stamp, compiled)
+        return compiled
+
+    def describe(self) -> Dict:
+        with self._lock:
+            return {"providers": sorted(f"{n}:{m}" if m else n for n, m, _ in self._providers),
+                    "datasets": sorted(self._datasets)}
+
+def _flag(body: Dict, name: str) -> bool:
+    value = body.get(name, False)
+    if not isinstance(value, bool):
+        raise ValueError(f"'{name}' must be true or false")
+    return value
+
+def normalize_job_params(body: Dict, dataset_roots: List[Path], results_dir: Path) -> Dict:
+    """
+    Validates a job submission and fills in the `polqa run` defaults. ``dataset``
+    must resolve under one of ``dataset_roots`` and ``out`` under ``results_dir``.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Job body must be a JSON object")
+    unknown = set(body) - JOB_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+    providers = body.get("providers")
+    if isinstance(providers, list) and all(isinstance(p, str) for p in providers):
+        providers = ",".join(providers)
+    if not isinstance(providers, str):
+        raise ValueError("'providers' must be a string or a list of strings")
+    if not parse_provider_specs(providers):
+        raise ValueError("'providers' is required")
+    dataset = body.get("dataset")
+    if not dataset:
+        raise ValueError("'dataset' is required")
+    if not _within(Path(dataset), dataset_roots):
+        raise ValueError(f"Dataset outside the allowed roots: {dataset}")
+    if not Path(dataset).is_file():
+        raise ValueError(f"Dataset not found: {dataset}")
+    out = body.get("out")
+    if out is not None:
+        if not isinstance(out, str) or not out or Path(out).is_absolute():
+            raise ValueError("'out' must be a path relative to the results directory")
+        out_path = results_dir / out
+        if not _within(out_path, [results_dir]) or out_path.resolve() == results_dir:
+            raise ValueError(f"'out' must stay inside the results directory: {out}")
+        out = str(out_path)
+    k = int(body.get("k", 1))
+    if k < 1:
+        raise ValueError("'k' must be >= 1")
+    size = body.get("size")
+    return {"providers": providers,
+            "dataset": dataset,
+            "seed": int(body["seed"]) if body.get("seed") is not None else None,
+            "size_mode": resolve_size_mode(_flag(body, "lite"), _flag(body, "medium"), _flag(body, "full")),
+            "size": int(size) if size is not None else None,
+            "force": _flag(body, "force"),
+            "k": k,
+            "temperature": float(body.get("temperature", 0.0)),
+            "out": out}
+
+class Job:
+    def __init__(self, job_id: str, params: Dict, generated_seed: bool, key: Optional[str] = None):
+        self.id = job_id
+        self.params = params
+        self.generated_seed = generated_seed
+        self.key = key
+        self.status = "queued"
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict] = [{"event": "status", "status": "queued"}]
+        self._cond = threading.Condition()
+
+    def emit(self, event: Dict):
+        with self._cond:
+            if event.get("event") == "status":
+                self.status = event["status"]
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def finish(self, result: Optional[Dict] = None, error: Optional[str] = None):
+        with self._cond:
+            self.result = result
+            self.error = error
+            self.status = "failed" if error else "done"
+            done = {"event": "done", "status": self.status}
+            if error:
+                done["error"] = error
+            else:
+                done["result"] = result
+            self.events.append(done)
+            self._cond.notify_all()
+
+    def iter_events(self, timeout: float = 30.0) -> Iterator[Dict]:
+        """Yields past and future events until the job finishes; stops early if idle for ``timeout``."""
+        sent = 0
+        while True:
+            with self._cond:
+                if sent >= len(self.events) and not self._cond.wait_for(lambda: sent < len(self.events), timeout):
+                    return
+                pending = self.events[sent:]
+            for event in pending:
+                yield event
+                if event["event"] == "done":
+                    return
+            sent += len(pending)
+
+    def to_dict(self) -> Dict:
+        with self._cond:
+            out = {"id": self.id, "status": self.status, "params": self.params}
+            if self.result is not None:
+                out["result"] = self.result
+            if self.error:
+                out["error"] = self.error
+            return out
+
+class JobQueue:
+    """
+    FIFO of evaluation jobs run by background workers; identical seeded jobs are
+    deduplicated. Only the newest ``max_finished`` finished jobs are kept.
+    """
+
+    def __init__(self, pool: WarmPool, workers: int = 1, max_finished: int = 200,
+                 dataset_roots: Optional[List[str]] = None, results_dir: str = "results"):
+        self.pool = pool
+        self.max_finished = max_finished
+        self.dataset_roots = [Path(r).resolve() for r in (dataset_roots or DEFAULT_DATASET_ROOTS)]
+        self.results_dir = Path(results_dir).resolve()
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[str, Job] = {}
+        self._finished: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: "Queue[Job]" = Queue()
+        for _ in range(max(workers, 1)):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def submit(self, body: Dict) -> Tuple[Job, bool]:
+        params = normalize_job_params(body, self.dataset_roots, self.results_dir)
+        generated_seed = params["seed"] is None
+        if generated_seed:
+            params["seed"] = secrets.randbelow(1_000_000)
+        # The dataset stamp makes an edited dataset a different job, matching when WarmPool reloads it.
+        try:
+            stamp = self.pool.dataset_stamp(params["dataset"])
+        except OSError as e:
+            raise ValueError(f"Dataset not readable: {e}")
+        key_material = {"params": params, "dataset_stamp": stamp}
+        key = hashlib.sha256(json.dumps(key_material, sort_keys=True).encode("utf-8")).hexdigest()
+        with self._lock:
+            existing = self._by_key.get(key)
+            if existing is not None and existing.status != "failed":
+                return existing, False
+            job = Job(uuid.uuid4().hex[:12], params, generated_seed, key=key)
+            self._jobs[job.id] = job
+            # Unseeded jobs are random by request, so never share their results.
+            if not generated_seed:
+                self._by_key[key] = job
+        self._queue.put(job)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [{"id": j.id, "status": j.status} for j in jobs]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._retire(job)
+                self._queue.task_done()
+
+    def _retire(self, job: Job):
+        """Records a finished job and evicts the oldest ones beyond ``max_finished``."""
+        with self._lock:
+            self._finished[job.id] = job
+            while len(self._finished) > self.max_finished:
+                _, old = self._finished.popitem(last=False)
+                self._jobs.pop(old.id, None)
+                if self._by_key.get(old.key) is old:
+                    del self._by_key[old.key]
+
+    def _run(self, job: Job):
+        p = job.params
+        job.emit({"event": "status", "status": "running"})
+        try:
+            results = run_evaluation(
+                provider_specs=parse_provider_specs(p["providers"]),
+                dataset_path=p["dataset"],
+                seed=p["seed"],
+                size_mode=p["size_mode"],
+                size=p["size"],
+                force=p["force"],
+                k=p["k"],
+                temperature=p["temperature"],
+                compiled=self.pool.dataset(p["dataset"]),
+                provider_factory=self.pool.provider,
+                on_model=lambda entry: job.emit({"event": "model", "model": entry}),
+            )
+            if p["out"]:
+                out = Path(p["out"])
+                out.parent.mkdir(parents=True, exist_ok=True)
+                with open(out, "w", encoding="utf-8") as f:
+                    json.dump(results, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            job.finish(error=f"{type(e).__name__}: {e}")
+        else:
+            job.finish(result=results)
+
+class PolqaRequestHandler(BaseHTTPRequestHandler):
+    server: "PolqaServer"
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> List[str]:
+        return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+    def do_GET(self):
+        parts = self._route()
+        if parts == ["health"]:
+            return self._send_json(200, {"status": "ok", **self.server.pool.describe()})
+        if parts == ["jobs"]:
+            return self._send_json(200, {"jobs": self.server.jobs.list()})
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.server.jobs.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": f"Unknown job: {parts[1]}"})
+            if len(parts) == 2:
+                return self._send_json(200, job.to_dict())
+            if parts[2] == "events":
+                return self._stream(job)
+        self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self._route() != ["jobs"]:
+            return self._send_json(404, {"error": "Not found"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            job, created = self.server.jobs.submit(body)
+        except (TypeError, ValueError) as e:
+            return self._send_json(400, {"error": str(e)})
+        payload = {"id": job.id, "status": job.status, "deduplicated": not created}
+        if job.generated_seed:
+            payload["seed"] = job.params["seed"]
+        self._send_json(202 if created else 200, payload)
+
+    def _stream(self, job: Job):
+        """Streams job events as newline-delimited JSON until the job finishes."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        self.close_connection = True
+        for event in job.iter_events(timeout=self.server.stream_timeout):
+            self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+class PolqaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], workers: int = 1,
+                 rate_limits: Optional[Dict[str, float]] = None,
+                 stream_timeout: float = 300.0, quiet: bool = False, max_finished_jobs: int = 200,
+                 dataset_roots: Optional[List[str]] = None, results_dir: str = "results",
+                 allow_remote: bool = False):
+        # There is no authentication, so only loopback binds are allowed by default.
+        if not allow_remote and not is_loopback_host(address[0]):
+            raise ValueError(f"Refusing to bind non-loopback address '{address[0]}' without allow_remote")
+        super().__init__(address, PolqaRequestHandler)
+        self.pool = WarmPool(rate_limits)
+        self.jobs = JobQueue(self.pool, workers=workers, max_finished=max_finished_jobs,
+                             dataset_roots=dataset_roots, results_dir=results_dir)
+        self.stream_timeout = stream_timeout
+        self.quiet = quiet
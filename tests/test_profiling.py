@@ -0,0 +1,24 @@
+import shutil
+from polqa.evaluation.runner import parse_provider_specs, run_evaluation
+from polqa.profiling import NULL_PROFILER, Profiler
+
+def test_profile_run_records_every_phase(tmp_path):
+    dataset = tmp_path / "ds.jsonl"
+    shutil.copy("polqa/datasets/politics_v1.jsonl", dataset)
+    profiler = Profiler(interval=0.001).start()
+    run_evaluation(parse_provider_specs("dummy"), str(dataset), seed=1,
+                   size_mode="lite", size=None, force=True, k=2, temperature=0.0, profiler=profiler)
+    collapsed = tmp_path / "run.collapsed"
+    summary = profiler.stop(collapsed_path=str(collapsed))
+    phases = {p["phase"]: p for p in summary["phases"]}
+    assert {"load", "select", "setup", "prompt", "generate", "parse", "score"} <= set(phases)
+    assert phases["generate"]["calls"] == 40
+    for line in collapsed.read_text(encoding="utf-8").splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("phase:") and int(count) > 0
+
+def test_null_profiler_is_a_noop():
+    with NULL_PROFILER.phase("load"):
+        with NULL_PROFILER.phase("parse"):
+            pass
+    assert not NULL_PROFILER.enabled
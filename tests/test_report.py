@@ -0,0 +1,54 @@
+import json
+from polqa.reporting import report_generator
+from polqa.reporting.report_generator import generate_comparative_report
+
+def _write_run(path, timestamp, econ):
+    run = {"seed": 1, "dataset": "d.jsonl", "timestamp": timestamp, "total_questions": 2,
+           "bounds": {"economic": [-4, 4], "social": [-4, 4]},
+           "models": [{"model": "dummy", "final_scores": {"economic": econ, "social": 0},
+                       "classification": "Center",
+                       "metrics": {"consistency_at_k": 1.0, "failure_rate": 0.0,
+                                   "latency_sec": {"p50": 0.1, "p90": 0.2, "p95": 0.3}}}]}
+    path.write_text(json.dumps(run), encoding="utf-8")
+    return str(path)
+
+def test_comparative_report_only_digests_new_runs(tmp_path, monkeypatch):
+    calls = []
+    digest = report_generator._digest_run
+    monkeypatch.setattr(report_generator, "_digest_run", lambda p, r: calls.append(p) or digest(p, r))
+    out = tmp_path / "history.html"
+    r1 = _write_run(tmp_path / "r1.json", "2025-01-01T00:00:00+00:00", 0)
+    r2 = _write_run(tmp_path / "r2.json", "2025-01-02T00:00:00+00:00", 4)
+    generate_comparative_report([r2, r1], output_path=str(out))
+    assert sorted(calls) == [r1, r2]
+
+    r3 = _write_run(tmp_path / "r3.json", "2025-01-03T00:00:00+00:00", -4)
+    generate_comparative_report([r1, r2, r3], output_path=str(out))
+    assert calls[2:] == [r3]
+    assert "Run History" in out.read_text(encoding="utf-8")
+
+def test_build_history_orders_runs_and_measures_drift():
+    runs = [{"path": "b", "timestamp": "2025-01-02", "models": [{"model": "m", "x": 100.0, "y": 50.0, "p50": 0.2}]},
+            {"path": "a", "timestamp": "2025-01-01", "models": [{"model": "m", "x": 50.0, "y": 50.0, "p50": 0.1}]}]
+    history = report_generator._build_history(runs)
+    assert [r["path"] for r in history["runs"]] == ["a", "b"]
+    model = history["models"][0]
+    assert model["points"][0]["step_drift"] is None
+    assert model["last"]["step_drift"] == 50.0
+    assert model["total_drift"] == 50.0
+
+def test_comparative_report_skips_non_run_json(tmp_path):
+    r1 = _write_run(tmp_path / "r1.json", "2025-01-01T00:00:00+00:00", 0)
+    others = []
+    for name, payload in (("notes.json", {"phases": []}),
+                          ("str_model.json", {"seed": 1, "dataset": "d", "models": ["dummy"]}),
+                          ("null_model.json", {"seed": 1, "dataset": "d", "models": [{"model": None}]})):
+        path = tmp_path / name
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        others.append(str(path))
+    skipped = []
+    out = tmp_path / "history.html"
+    generate_comparative_report([r1] + others, output_path=str(out),
+                                on_skip=lambda p, why: skipped.append(p))
+    assert skipped == others
+    assert "notes.json" not in out.read_text(encoding="utf-8")
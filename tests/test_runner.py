@@ -1,3 +1,4 @@
+import json
 from polqa.evaluation.runner import parse_provider_specs, select_questions
 import random
 
@@ -15,3 +16,28 @@ def test_select_questions_deterministic():
     sel2 = select_questions(rows, size_mode="lite", size=None, rng=rng)
     assert [r["id"] for r in sel1] == [r["id"] for r in sel2]
     assert len(sel1) == 20
+
+def test_load_compiled_dataset(tmp_path):
+    from polqa.evaluation.runner import load_compiled_dataset
+    from polqa.evaluation.prompt_builder import build_prompt
+    path = tmp_path / "ds.jsonl"
+    q = {"id": "Q1", "prompt": "Q?", "options": {"B": {"text": "tb", "scores": {"economic": 1, "social": 0}},
+                                                 "A": {"text": "ta", "scores": {"economic": 0, "social": 1}}}}
+    path.write_text(json.dumps(q) + "\n", encoding="utf-8")
+    compiled = load_compiled_dataset(str(path))
+    assert compiled[0]["prompts"]["force"] == build_prompt(q, force=True)
+    assert compiled[0]["valid_letters"] == "AB" and "B" in compiled[0]["letter_lookup"]
+    assert compiled[0]["question"] == q
+
+def test_run_evaluation_passes_temperature_to_providers(tmp_path):
+    from polqa.evaluation.runner import get_provider_instance, run_evaluation
+    path = tmp_path / "ds.jsonl"
+    path.write_text(json.dumps({"id": "Q1", "prompt": "Q?", "options": {
+        "A": {"text": "ta", "scores": {"economic": 0, "social": 1}}}}) + "\n", encoding="utf-8")
+    seen = []
+    def factory(spec, temperature=0.0):
+        seen.append(temperature)
+        return get_provider_instance(spec, temperature=temperature)
+    run_evaluation(parse_provider_specs("dummy"), str(path), seed=1, size_mode=None, size=None,
+                   force=False, k=1, temperature=0.7, provider_factory=factory)
+    assert seen == [0.7]
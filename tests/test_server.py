@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import threading
+import urllib.request
+from pathlib import Path
+import pytest
+from polqa.server import (JobQueue, PolqaServer, RateLimiter, WarmPool, normalize_job_params,
+                          parse_rate_limits)
+
+DATASET = "polqa/datasets/politics_v1.jsonl"
+
+@pytest.fixture
+def dataset(tmp_path):
+    """A private copy of the bundled dataset; jobs must not write next to the package copy."""
+    path = tmp_path / "ds.jsonl"
+    shutil.copy(DATASET, path)
+    return path
+
+def _queue(dataset, **kwargs):
+    return JobQueue(WarmPool(), dataset_roots=[str(dataset.parent)], **kwargs)
+
+def _request(base, path, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(base + path, data=data, method="POST" if data else "GET",
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return resp.status, resp.read().decode("utf-8")
+
+def test_serve_runs_dedupes_and_streams_dummy_jobs(dataset):
+    server = PolqaServer(("127.0.0.1", 0), quiet=True, stream_timeout=10, dataset_roots=[str(dataset.parent)])
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        job = {"providers": "dummy,dummy:b", "dataset": str(dataset), "seed": 7, "lite": True, "force": True, "k": 2}
+        status, body = _request(base, "/jobs", job)
+        first = json.loads(body)
+        assert status == 202 and not first["deduplicated"]
+
+        status, body = _request(base, f"/jobs/{first['id']}/events")
+        events = [json.loads(line) for line in body.splitlines()]
+        assert [e["model"]["model"] for e in events if e["event"] == "model"] == ["dummy", "dummy:b"]
+        assert events[-1]["status"] == "done"
+        assert events[-1]["result"]["total_questions"] == 20
+
+        status, body = _request(base, "/jobs", job)
+        assert status == 200 and json.loads(body)["id"] == first["id"]
+
+        health = json.loads(_request(base, "/health")[1])
+        assert health["providers"] == ["dummy", "dummy:b"]
+        assert health["datasets"] == [str(dataset)]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_rate_limits():
+    assert parse_rate_limits("openai=2, Gemini=0.5") == {"openai": 2.0, "gemini": 0.5}
+    assert RateLimiter(4).interval == 0.25
+    assert RateLimiter().interval == 0.0
+
+def test_job_flags_must_be_booleans():
+    with pytest.raises(ValueError):
+        normalize_job_params({"providers": "dummy", "dataset": DATASET, "force": "false"},
+                             [Path("polqa/datasets").resolve()], Path("results").resolve())
+
+def test_dataset_edit_defeats_dedup(dataset):
+    jobs = _queue(dataset)
+    body = {"providers": "dummy", "dataset": str(dataset), "seed": 1, "lite": True}
+    first, _ = jobs.submit(body)
+    assert jobs.submit(body) == (first, False)
+    dataset.write_text(dataset.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    os.utime(dataset, ns=(1, 1))
+    second, created = jobs.submit(body)
+    assert created and second.id != first.id
+
+def test_finished_jobs_are_evicted(dataset):
+    jobs = _queue(dataset, max_finished=2)
+    submitted = [jobs.submit({"providers": "dummy", "dataset": str(dataset), "seed": s, "lite": True})[0]
+                 for s in range(4)]
+    jobs._queue.join()
+    assert [j["id"] for j in jobs.list()] == [j.id for j in submitted[2:]]
+    assert jobs.submit({"providers": "dummy", "dataset": str(dataset), "seed": 0, "lite": True})[1]
+
+def test_job_paths_are_confined(tmp_path):
+    roots, results = [(tmp_path / "data").resolve()], (tmp_path / "results").resolve()
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "ds.jsonl").write_text("{}\n", encoding="utf-8")
+    (tmp_path / "secret.jsonl").write_text("{}\n", encoding="utf-8")
+    ok = normalize_job_params({"providers": "dummy", "dataset": str(tmp_path / "data" / "ds.jsonl"),
+                               "out": "nightly/run.json"}, roots, results)
+    assert ok["out"] == str(results / "nightly" / "run.json")
+    for body in ({"dataset": str(tmp_path / "secret.jsonl")},
+                 {"dataset": str(tmp_path / "data" / ".." / "secret.jsonl")},
+                 {"dataset": str(tmp_path / "data" / "ds.jsonl"), "out": "../escape.json"},
+                 {"dataset": str(tmp_path / "data" / "ds.jsonl"), "out": str(tmp_path / "abs.json")}):
+        with pytest.raises(ValueError):
+            normalize_job_params({"providers": "dummy", **body}, roots, results)
+
+def test_non_loopback_bind_requires_opt_in():
+    with pytest.raises(ValueError):
+        PolqaServer(("0.0.0.0", 0), quiet=True)
+
+@pytest.mark.parametrize("providers", [5, None, ["dummy", 5], {"name": "dummy"}])
+def test_providers_must_be_strings(providers):
+    with pytest.raises(ValueError):
+        normalize_job_params({"providers": providers, "dataset": DATASET},
+                             [Path("polqa/datasets").resolve()], Path("results").resolve())
+
+def test_dataset_vanishing_after_validation_is_a_value_error(dataset, monkeypatch):
+    jobs = _queue(dataset)
+    def gone(path):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(jobs.pool, "dataset_stamp", gone)
+    with pytest.raises(ValueError):
+        jobs.submit({"providers": "dummy", "dataset": str(dataset), "seed": 1})
@@ -0,0 +1,41 @@
+import json
+from polqa.evaluation import validator
+from polqa.evaluation.validator import split_byte_ranges, validate_dataset
+
+def _row(qid, letters="ABC"):
+    return json.dumps({"id": qid, "prompt": "Q?",
+                       "options": {l: {"text": l, "scores": {"economic": i - 1, "social": 1 - i}}
+                                   for i, l in enumerate(letters)}})
+
+def test_reports_all_errors_with_file_line_numbers(tmp_path):
+    path = tmp_path / "ds.jsonl"
+    path.write_text("\n".join([_row("Q1"), "", "{not json", _row("Q2", "ABD"), _row("Q1")]) + "\n", encoding="utf-8")
+    report = validate_dataset(str(path), workers=1)
+    assert not report["ok"]
+    assert report["errors"][0].startswith("Line 3: invalid JSON")
+    assert report["errors"][1].startswith("Line 4: option letters")
+    assert report["errors"][2] == "Line 5: duplicate id 'Q1' (first seen at line 1)"
+    assert report["stats"]["option_counts"] == {3: 2}
+    assert report["stats"]["bounds"]["economic"] == (-2, 2)
+
+def test_parallel_ranges_match_serial(tmp_path, monkeypatch):
+    path = tmp_path / "ds.jsonl"
+    path.write_text("\n".join(_row(f"Q{i % 150}") for i in range(200)) + "\n", encoding="utf-8")
+    ranges = split_byte_ranges(str(path), chunk=1000)
+    assert len(ranges) > 1 and ranges[-1][1] == path.stat().st_size
+    serial = validate_dataset(str(path), workers=1)
+    monkeypatch.setattr(validator, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(validator, "MIN_CHUNK_BYTES", 1000)
+    parallel = validate_dataset(str(path), workers=2)
+    assert parallel == serial
+    assert len(serial["errors"]) == 50
+
+def test_unreadable_path_is_reported(tmp_path):
+    report = validate_dataset(str(tmp_path), workers=1)
+    assert not report["ok"] and report["errors"]
+
+def test_boolean_id_is_not_a_duplicate_of_one(tmp_path):
+    path = tmp_path / "ds.jsonl"
+    path.write_text("\n".join([_row(1), _row(True)]) + "\n", encoding="utf-8")
+    report = validate_dataset(str(path), workers=1)
+    assert report["errors"] == ["Line 2: 'id' must be a string or integer"]